@@ -3,36 +3,161 @@ Verified Grounding Logic
 Validates extracted data and communicates with Node.js backend
 Implements the "no hallucination" policy
 """
-import httpx
+import asyncio
+import logging
+import orjson
 from typing import List, Dict
-from datetime import datetime
+from datetime import datetime, timezone
 
 from agent.models import VerifiedPrice, VerifiedSentiment, ProductData, AgentThought
 from config import config
 
+# httpxr exposes the same AsyncClient API; plain httpx stays the default
+if config.USE_HTTPXR:
+    try:
+        import httpxr as httpx
+    except ImportError:
+        import httpx
+else:
+    import httpx
+
+
+logger = logging.getLogger("velocity.grounding")
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_ERROR_BODY_LIMIT = 512  # Bytes of an error response worth logging
+
+
+def _json(payload):
+    """Serialize a request body with orjson instead of httpx's stdlib json"""
+    return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS), _JSON_HEADERS
+
+
+async def _read_prefix(response, limit: int = _ERROR_BODY_LIMIT) -> str:
+    """Read at most `limit` bytes of a streamed response body for logging"""
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        if len(buffer) >= limit:
+            break
+    return buffer[:limit].decode('utf-8', 'replace')
+
 
 class GroundingValidator:
     """Validates and grounds data with mandatory source verification"""
     
     def __init__(self):
-        self.backend_url = config.NODE_BACKEND_URL
-        self.thoughts: List[AgentThought] = []
+        # Thoughts stream to the backend in batches; the bound caps memory on long scrapes
+        self._log_queue: asyncio.Queue = asyncio.Queue(maxsize=config.LOG_QUEUE_SIZE)
+        self._log_task = None
+        self._product_ids: Dict[tuple, int] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._client = None
+        # True inside `async with`; otherwise each process_scraped_data call cleans up after itself
+        self._entered = False
+    
+    async def __aenter__(self):
+        self._entered = True
+        self._start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self._entered = False
+        await self.close()
+    
+    def _start(self):
+        """Open the backend client and start the log flusher, if not already running"""
+        if self._client is None:
+            # One pooled client for every backend call so keep-alive connections are reused.
+            # The base URL is parsed once here; call sites pass relative paths.
+            self._client = httpx.AsyncClient(
+                base_url=config.NODE_BACKEND_URL,
+                timeout=30.0,
+                http2=config.BACKEND_HTTP2,
+                limits=httpx.Limits(
+                    max_keepalive_connections=config.BACKEND_MAX_KEEPALIVE,
+                    max_connections=config.BACKEND_MAX_CONNECTIONS
+                )
+            )
+        if self._log_task is None:
+            self._log_task = asyncio.create_task(self._flush_logs())
+    
+    async def close(self):
+        """Flush pending agent logs and release pooled backend connections"""
+        if self._log_task:
+            await self._log_queue.join()
+            self._log_task.cancel()
+            self._log_task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
     
     def log_thought(self, thought: str, action: str, status: str):
         """Log agent's reasoning for transparency"""
-        agent_thought = AgentThought(
+        self._enqueue_thought(AgentThought(
             thought=thought,
             action=action,
             status=status
-        )
-        self.thoughts.append(agent_thought)
-        print(f"[AGENT] {thought} | Action: {action} | Status: {status}")
+        ))
+        logger.info("[AGENT] %s | Action: %s | Status: %s", thought, action, status)
+    
+    def _enqueue_thought(self, agent_thought: AgentThought):
+        """Hand a thought to the background flusher without blocking the caller"""
+        self._start()
+        try:
+            self._log_queue.put_nowait(agent_thought)
+        except asyncio.QueueFull:
+            logger.warning("Agent log queue full, dropping thought: %s", agent_thought.thought)
     
     async def process_scraped_data(self, scraped_items: List[Dict]) -> Dict:
         """
         Process scraped data with verified grounding.
         Each data point must have a source URL or it will be rejected.
         """
+        self._start()
+        try:
+            results = {
+                'products_created': 0,
+                'prices_added': 0,
+                'sentiments_added': 0,
+                'errors': []
+            }
+            
+            # Items are independent round-trips, so fan them out under a concurrency cap
+            sem = asyncio.Semaphore(config.MAX_CONCURRENCY)
+            
+            async def _bounded(item: Dict) -> Dict:
+                async with sem:
+                    return await self._process_one(item)
+            
+            partials = await asyncio.gather(
+                *(_bounded(item) for item in scraped_items),
+                return_exceptions=True
+            )
+            
+            # Tasks never touch a shared accumulator; their partials are folded once, in item order
+            for partial in partials:
+                if isinstance(partial, BaseException):
+                    error_msg = f"Error processing item: {str(partial)}"
+                    results['errors'].append(error_msg)
+                    self.log_thought(error_msg, "Item Processing", "error")
+                    continue
+                results['products_created'] += partial['products_created']
+                results['prices_added'] += partial['prices_added']
+                results['sentiments_added'] += partial['sentiments_added']
+                results['errors'].extend(partial['errors'])
+            
+            # Send agent thoughts to backend
+            await self._send_agent_logs(results)
+            
+            return results
+        finally:
+            if not self._entered:
+                # Used without `async with`: deliver queued thoughts and release the client now
+                await self.close()
+    
+    async def _process_one(self, item: Dict) -> Dict:
+        """Ground a single scraped item and return its partial result counts"""
         results = {
             'products_created': 0,
             'prices_added': 0,
@@ -40,87 +165,158 @@ class GroundingValidator:
             'errors': []
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for item in scraped_items:
-                try:
-                    self.log_thought(
-                        f"Processing product: {item.get('name', 'Unknown')}",
-                        "Data Validation",
-                        "running"
-                    )
-                    
-                    # Step 1: Create or find product
-                    product_id = await self._create_product(client, item)
-                    
-                    if not product_id:
-                        self.log_thought(
-                            f"Failed to create product: {item.get('name')}",
-                            "Product Creation",
-                            "error"
+        # Read each field once; the lookups below reuse these locals
+        name = item.get('name', 'Unknown Product')
+        price = item.get('price')
+        src = item.get('source_url')
+        sent_score = item.get('sentiment_score')
+        sent_src = item.get('sentiment_source_url')
+        
+        try:
+            self.log_thought(
+                f"Processing product: {name}",
+                "Data Validation",
+                "running"
+            )
+            
+            # Step 1: Create or find product
+            product_id, created = await self._create_product(item)
+            
+            if not product_id:
+                self.log_thought(
+                    f"Failed to create product: {name}",
+                    "Product Creation",
+                    "error"
+                )
+                results['errors'].append(f"Failed to create product: {name}")
+                return results
+            
+            # Reused products are not new rows; only count actual creations
+            if created:
+                results['products_created'] += 1
+            
+            # Step 2: Validate price and sentiment against their sources.
+            # Common bad inputs are rejected cheaply before paying for a ValidationError.
+            # Scraped items are untrusted web data, so the models are always fully
+            # validated here (never model_construct) - this is the grounding boundary.
+            saves = []
+            if price is not None and src is not None:
+                if not src or (isinstance(price, (int, float)) and price <= 0):
+                    error_msg = f"Skipping price for {name}: missing source_url or non-positive price"
+                    results['errors'].append(error_msg)
+                    self.log_thought(error_msg, "Price Validation", "error")
+                else:
+                    try:
+                        verified_price = VerifiedPrice(
+                            product_id=product_id,
+                            price=price,
+                            currency=item.get('currency', 'USD'),
+                            source_url=src
                         )
-                        results['errors'].append(f"Failed to create product: {item.get('name')}")
-                        continue
-                    
-                    results['products_created'] += 1
-                    
-                    # Step 2: Add price with verified source
-                    if 'price' in item and 'source_url' in item:
-                        try:
-                            verified_price = VerifiedPrice(
-                                product_id=product_id,
-                                price=item['price'],
-                                currency=item.get('currency', 'USD'),
-                                source_url=item['source_url']
-                            )
-                            
-                            success = await self._save_price(client, product_id, verified_price)
-                            if success:
-                                results['prices_added'] += 1
-                                self.log_thought(
-                                    f"[OK] Verified price: ${item['price']} from {item['source_url']}",
-                                    "Price Verification",
-                                    "success"
-                                )
-                        except Exception as e:
-                            error_msg = f"Price validation failed: {str(e)}"
-                            results['errors'].append(error_msg)
-                            self.log_thought(error_msg, "Price Validation", "error")
-                    
-                    # Step 3: Add sentiment with verified source
-                    if 'sentiment_score' in item and 'sentiment_source_url' in item:
-                        try:
-                            verified_sentiment = VerifiedSentiment(
-                                product_id=product_id,
-                                sentiment_score=item['sentiment_score'],
-                                sentiment_text=item.get('sentiment_text', ''),
-                                source_url=item['sentiment_source_url']
-                            )
-                            
-                            success = await self._save_sentiment(client, verified_sentiment)
-                            if success:
-                                results['sentiments_added'] += 1
-                                self.log_thought(
-                                    f"[OK] Verified sentiment: {item['sentiment_score']} from {item['sentiment_source_url']}",
-                                    "Sentiment Verification",
-                                    "success"
-                                )
-                        except Exception as e:
-                            error_msg = f"Sentiment validation failed: {str(e)}"
-                            results['errors'].append(error_msg)
-                            self.log_thought(error_msg, "Sentiment Validation", "error")
-                
-                except Exception as e:
-                    error_msg = f"Error processing item: {str(e)}"
+                        price_payload = verified_price.model_dump(mode='json')
+                        saves.append(('price', self._save_price(product_id, price_payload)))
+                    except Exception as e:
+                        error_msg = f"Price validation failed: {str(e)}"
+                        results['errors'].append(error_msg)
+                        self.log_thought(error_msg, "Price Validation", "error")
+            
+            if sent_score is not None and sent_src is not None:
+                if not sent_src or (isinstance(sent_score, (int, float)) and not -1.0 <= sent_score <= 1.0):
+                    error_msg = f"Skipping sentiment for {name}: missing source_url or score outside [-1, 1]"
                     results['errors'].append(error_msg)
-                    self.log_thought(error_msg, "Item Processing", "error")
+                    self.log_thought(error_msg, "Sentiment Validation", "error")
+                else:
+                    try:
+                        verified_sentiment = VerifiedSentiment(
+                            product_id=product_id,
+                            sentiment_score=sent_score,
+                            sentiment_text=item.get('sentiment_text', ''),
+                            source_url=sent_src
+                        )
+                        sentiment_payload = verified_sentiment.model_dump(mode='json')
+                        saves.append(('sentiment', self._save_sentiment(sentiment_payload)))
+                    except Exception as e:
+                        error_msg = f"Sentiment validation failed: {str(e)}"
+                        results['errors'].append(error_msg)
+                        self.log_thought(error_msg, "Sentiment Validation", "error")
+            
+            # Step 3: Price and sentiment are independent once the product exists
+            outcomes = await asyncio.gather(
+                *(coro for _, coro in saves),
+                return_exceptions=True
+            )
+            
+            for (kind, _), outcome in zip(saves, outcomes):
+                if kind == 'price':
+                    if isinstance(outcome, BaseException):
+                        error_msg = f"Price validation failed: {str(outcome)}"
+                        results['errors'].append(error_msg)
+                        self.log_thought(error_msg, "Price Validation", "error")
+                    elif outcome:
+                        results['prices_added'] += 1
+                        self.log_thought(
+                            f"[OK] Verified price: ${price} from {src}",
+                            "Price Verification",
+                            "success"
+                        )
+                else:
+                    if isinstance(outcome, BaseException):
+                        error_msg = f"Sentiment validation failed: {str(outcome)}"
+                        results['errors'].append(error_msg)
+                        self.log_thought(error_msg, "Sentiment Validation", "error")
+                    elif outcome:
+                        results['sentiments_added'] += 1
+                        self.log_thought(
+                            f"[OK] Verified sentiment: {sent_score} from {sent_src}",
+                            "Sentiment Verification",
+                            "success"
+                        )
         
-        # Send agent thoughts to backend
-        await self._send_agent_logs(results)
+        except Exception as e:
+            error_msg = f"Error processing item: {str(e)}"
+            results['errors'].append(error_msg)
+            self.log_thought(error_msg, "Item Processing", "error")
         
         return results
     
-    async def _create_product(self, client: httpx.AsyncClient, item: Dict) -> int:
-        """Create product in backend database"""
+    async def _create_product(self, item: Dict) -> tuple[int, bool]:
+        """
+        Create product in backend database, reusing the id of an identical product.
+        Returns (product_id, created); created is False when an existing id was reused.
+        """
+        # source_url is part of the key: live pages with a fallback or generic name
+        # ('Unknown Product' on the same domain) must not collapse into one product
+        key = (
+            item.get('name', 'Unknown Product'),
+            item.get('category'),
+            item.get('competitor'),
+            item.get('source_url')
+        )
+        if key in self._product_ids:
+            return self._product_ids[key], False
+        
+        # Single-flight: concurrent items for the same product await the first POST
+        if key in self._inflight:
+            return await self._inflight[key], False
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            product_id = await self._post_product(item)
+            if product_id:
+                self._product_ids[key] = product_id
+            future.set_result(product_id)
+            return product_id, product_id is not None
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._inflight[key]
+    
+    async def _post_product(self, item: Dict) -> int:
+        """POST a new product to the backend"""
         try:
             product_data = {
                 'name': item.get('name', 'Unknown Product'),
@@ -129,68 +325,101 @@ class GroundingValidator:
                 'insight': item.get('insight', '')  # Business insights for decision-making
             }
             
-            response = await client.post(
-                f"{self.backend_url}/api/products",
-                json=product_data
-            )
-            
-            if response.status_code == 201:
-                data = response.json()
-                return data['data']['id']
-            else:
-                print(f"Failed to create product: {response.text}")
+            data, headers = _json(product_data)
+            async with self._client.stream(
+                "POST",
+                "/api/products",
+                content=data,
+                headers=headers
+            ) as response:
+                if response.status_code == 201:
+                    await response.aread()
+                    return response.json()['data']['id']
+                
+                # Only pull the head of an error page (e.g. a proxy's 5xx HTML), never the whole body
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error("Failed to create product: %s", await _read_prefix(response))
                 return None
                 
         except Exception as e:
-            print(f"Error creating product: {e}")
+            logger.error("Error creating product: %s", e)
             return None
     
-    async def _save_price(self, client: httpx.AsyncClient, product_id: int, verified_price: VerifiedPrice) -> bool:
-        """Save verified price to backend"""
+    async def _save_price(self, product_id: int, payload: Dict) -> bool:
+        """Save verified price payload (already dumped from VerifiedPrice) to backend"""
         try:
-            response = await client.post(
-                f"{self.backend_url}/api/products/{product_id}/prices",
-                json=verified_price.model_dump(mode='json')
+            data, headers = _json(payload)
+            response = await self._client.post(
+                f"/api/products/{product_id}/prices",
+                content=data,
+                headers=headers
             )
             return response.status_code == 201
         except Exception as e:
-            print(f"Error saving price: {e}")
+            logger.error("Error saving price: %s", e)
             return False
     
-    async def _save_sentiment(self, client: httpx.AsyncClient, verified_sentiment: VerifiedSentiment) -> bool:
-        """Save verified sentiment to backend"""
+    async def _save_sentiment(self, payload: Dict) -> bool:
+        """Save verified sentiment payload (already dumped from VerifiedSentiment) to backend"""
         try:
-            response = await client.post(
-                f"{self.backend_url}/api/sentiment",
-                json=verified_sentiment.model_dump(mode='json')
+            data, headers = _json(payload)
+            response = await self._client.post(
+                "/api/sentiment",
+                content=data,
+                headers=headers
             )
             return response.status_code == 201
         except Exception as e:
-            print(f"Error saving sentiment: {e}")
+            logger.error("Error saving sentiment: %s", e)
             return False
     
     async def _send_agent_logs(self, results: Dict):
+        """Queue the run summary; individual thoughts are already streaming to the backend"""
+        self._enqueue_thought(AgentThought(
+            thought=f"Created {results['products_created']} products, {results['prices_added']} prices, {results['sentiments_added']} sentiments",
+            action='Scraping Complete',
+            status='success' if not results['errors'] else 'warning'
+        ))
+    
+    async def _flush_logs(self):
+        """Background consumer: batch queued thoughts into bulk log POSTs"""
+        while True:
+            batch = [await self._log_queue.get()]
+            try:
+                while len(batch) < config.LOG_BATCH_SIZE:
+                    batch.append(await asyncio.wait_for(
+                        self._log_queue.get(),
+                        timeout=config.LOG_FLUSH_INTERVAL
+                    ))
+            except asyncio.TimeoutError:
+                pass
+            
+            try:
+                await self._post_logs(batch)
+            finally:
+                for _ in batch:
+                    self._log_queue.task_done()
+    
+    async def _post_logs(self, thoughts: List[AgentThought]):
         """Send agent activity logs to backend for transparency"""
+        entries = [
+            {
+                'action': thought.action,
+                'status': thought.status,
+                'details': thought.thought,
+                'timestamp': thought.timestamp.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            }
+            for thought in thoughts
+        ]
+        
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                for thought in self.thoughts:
-                    await client.post(
-                        f"{self.backend_url}/api/agent/log",
-                        json={
-                            'action': thought.action,
-                            'status': thought.status,
-                            'details': thought.thought
-                        }
-                    )
-                
-                # Send summary log
-                await client.post(
-                    f"{self.backend_url}/api/agent/log",
-                    json={
-                        'action': 'Scraping Complete',
-                        'status': 'success' if not results['errors'] else 'warning',
-                        'details': f"Created {results['products_created']} products, {results['prices_added']} prices, {results['sentiments_added']} sentiments"
-                    }
-                )
+            # One round-trip for the whole batch instead of one POST per thought
+            data, headers = _json({'entries': entries})
+            await self._client.post(
+                "/api/agent/log/bulk",
+                content=data,
+                headers=headers,
+                timeout=10.0
+            )
         except Exception as e:
-            print(f"Error sending agent logs: {e}")
+            logger.error("Error sending agent logs: %s", e)
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, HttpUrl, validator, Field
+from dataclasses import dataclass, field
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field
 from typing import Optional
 from datetime import datetime
 
@@ -12,15 +13,10 @@ class VerifiedPrice(BaseModel):
     currency: str = Field(default="USD", description="Currency code")
     source_url: HttpUrl = Field(..., description="REQUIRED: Live web source for this price")
     
-    @validator('source_url')
-    def validate_source(cls, v):
-        """Ensure source URL is not None or empty"""
-        if not v:
-            raise ValueError('source_url is REQUIRED for verified grounding - no hallucinations allowed')
-        return v
-    
-    class Config:
-        json_schema_extra = {
+    # HttpUrl already rejects missing/empty sources inside pydantic-core
+    model_config = ConfigDict(
+        extra='ignore',
+        json_schema_extra={
             "example": {
                 "product_id": 1,
                 "price": 79.99,
@@ -28,6 +24,7 @@ class VerifiedPrice(BaseModel):
                 "source_url": "https://example.com/product/123"
             }
         }
+    )
 
 
 class VerifiedSentiment(BaseModel):
@@ -41,15 +38,9 @@ class VerifiedSentiment(BaseModel):
     raw_reviews: Optional[list[str]] = Field(default=None, description="Raw review texts extracted from page (first 3)")
     source_url: HttpUrl = Field(..., description="REQUIRED: Live web source for this sentiment")
     
-    @validator('source_url')
-    def validate_source(cls, v):
-        """Ensure source URL is not None or empty"""
-        if not v:
-            raise ValueError('source_url is REQUIRED for verified grounding - no hallucinations allowed')
-        return v
-    
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        extra='ignore',
+        json_schema_extra={
             "example": {
                 "product_id": 1,
                 "sentiment_score": 0.8,
@@ -58,6 +49,7 @@ class VerifiedSentiment(BaseModel):
                 "source_url": "https://example.com/reviews/456"
             }
         }
+    )
 
 
 class ProductData(BaseModel):
@@ -80,9 +72,13 @@ class ScrapeResult(BaseModel):
     errors: Optional[list] = None
 
 
-class AgentThought(BaseModel):
-    """Agent's reasoning/thought process for transparency"""
-    timestamp: datetime = Field(default_factory=datetime.now)
-    thought: str = Field(..., description="What the agent is thinking/doing")
-    action: str = Field(..., description="Action being taken")
-    status: str = Field(..., description="Status: running, success, error")
+@dataclass(slots=True)
+class AgentThought:
+    """
+    Agent's reasoning/thought process for transparency.
+    Internal-only record, so a slotted dataclass instead of a validated model.
+    """
+    thought: str  # What the agent is thinking/doing
+    action: str  # Action being taken
+    status: str  # Status: running, success, error
+    timestamp: datetime = field(default_factory=datetime.now)
@@ -3,21 +3,246 @@ Playwright Browser Automation for Web Scraping
 Implements stealth mode and extracts pricing/sentiment data
 """
 import asyncio
+import logging
 import random
 import re
-from typing import List, Dict, Optional
-from playwright.async_api import async_playwright, Page, Browser
-from bs4 import BeautifulSoup
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import AsyncIterator, List, Dict, Optional
+from urllib.parse import urlparse
+import httpx
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, TimeoutError as PlaywrightTimeoutError
+from selectolax.lexbor import LexborHTMLParser
 
 from config import config
 
 
+logger = logging.getLogger("velocity.scraper")
+
+# Compiled once at import; these run for every price string and review
+_PRICE_RE = re.compile(r'[\d,]+\.?\d*')
+# Thousands separators dropped, then currency symbols trimmed, for a bare price like "$1,099.50"
+_PRICE_STRIP = str.maketrans('', '', ',')
+_PRICE_EDGES = '$€£¥ \t\r\n\u00a0'
+_POS_WORDS = frozenset({'great', 'excellent', 'amazing', 'love', 'perfect'})
+_NEG_WORDS = frozenset({'bad', 'terrible', 'poor', 'worst', 'waste'})
+_SENT_RE = re.compile(r'\b(' + '|'.join(sorted(_POS_WORDS | _NEG_WORDS)) + r')\b')
+_SENT_SIGN = {word: 1 for word in _POS_WORDS} | {word: -1 for word in _NEG_WORDS}
+
+# All stealth patches in one blob, registered once per context so every page inherits it
+STEALTH_JS = """
+    // Override webdriver detection
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    // Headless Chrome lacks window.chrome.runtime
+    window.chrome = window.chrome || {};
+    window.chrome.runtime = window.chrome.runtime || {};
+    // Headless Chrome reports an empty plugin list
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    });
+    // Notification permission query is inconsistent in headless mode
+    if (navigator.permissions && navigator.permissions.query) {
+        const originalQuery = navigator.permissions.query.bind(navigator.permissions);
+        navigator.permissions.query = (parameters) => (
+            parameters && parameters.name === 'notifications'
+                ? Promise.resolve({ state: Notification.permission })
+                : originalQuery(parameters)
+        );
+    }
+"""
+
+# Resource types that never affect the text we extract
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+# Ad/analytics hosts (subdomains included) that only delay the page
+_BLOCKED_HOSTS = frozenset({
+    'doubleclick.net', 'googlesyndication.com', 'googletagmanager.com', 'googletagservices.com',
+    'google-analytics.com', 'adservice.google.com', 'amazon-adsystem.com', 'facebook.net',
+    'scorecardresearch.com', 'criteo.com', 'criteo.net', 'taboola.com',
+    'outbrain.com', 'hotjar.com', 'segment.io', 'segment.com', 'newrelic.com', 'nr-data.net',
+    'quantserve.com', 'adsrvr.org', 'bat.bing.com', 'clarity.ms', 'analytics.tiktok.com',
+})
+
+
+def _is_blocked_host(url: str) -> bool:
+    """True when the URL's host, or any parent domain of it, is on the blocklist"""
+    labels = (urlparse(url).hostname or '').split('.')
+    return any('.'.join(labels[i:]) in _BLOCKED_HOSTS for i in range(len(labels) - 1))
+
+
+# Usually bot walls or rate limits on plain HTTP, which a real browser can still get past
+_BROWSER_RETRY_STATUSES = frozenset({403, 429})
+# Largest HTML body the static fast path will read; bigger pages go to the browser
+_STATIC_MAX_BYTES = 2 * 1024 * 1024
+
+
+class UnscrapableURLError(Exception):
+    """URL is a dead link or not a web page; neither the static path nor a browser can scrape it"""
+
+
+async def _block_heavy_resources(route):
+    """Context-wide route handler: abort downloads we don't need for text extraction"""
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or _is_blocked_host(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _demo_product(product: Dict) -> MappingProxyType:
+    """Freeze a demo product with its source URLs precomputed"""
+    slug = product['name'].lower().replace(' ', '-')
+    return MappingProxyType(dict(
+        product,
+        source_url=f"https://example.com/products/{slug}",
+        sentiment_source_url=f"https://example.com/reviews/{slug}"
+    ))
+
+
+# Demo product pool, built once at import
+_PRODUCT_POOL = tuple(map(_demo_product, (
+    {'name': 'UltraSound Pro Headphones', 'category': 'Electronics', 'competitor': 'AudioTech', 
+     'price': 149.99, 'sentiment_score': 0.85, 'sentiment_text': 'Excellent sound quality',
+     'insight': 'Strong satisfaction. Premium pricing justified.'},
+    {'name': 'SmartHome Hub Pro', 'category': 'Electronics', 'competitor': 'HomeTech', 
+     'price': 89.99, 'sentiment_score': 0.78, 'sentiment_text': 'Easy setup',
+     'insight': 'Good value at $90.'},
+    {'name': 'Air Purifier Max', 'category': 'Home Appliances', 'competitor': 'CleanAir', 
+     'price': 159.99, 'sentiment_score': 0.91, 'sentiment_text': 'Great air quality',
+     'insight': 'TOP PERFORMER - Capitalize on health trends.'},
+)))
+
+# Candidate selectors, tried in order
+_NAME_SELECTORS = ['h1', '[data-test="product-title"]', '.product-title', '#productTitle']
+_PRICE_SELECTORS = ['[data-test="product-price"]', '.price', '[itemprop="price"]']
+_REVIEW_SELECTORS = ['[data-test="review-text"]', '.review-text', '.review-content']
+
+# Known retailers: their stable selectors go first, generic lists stay as the fallback.
+# Keyed by netloc without "www."; values are (name, price, review) selector lists.
+_SITE_SELECTORS = {
+    domain: (name + _NAME_SELECTORS, price + _PRICE_SELECTORS, reviews + _REVIEW_SELECTORS)
+    for domain, (name, price, reviews) in {
+        'amazon.com': (
+            ['#productTitle'],
+            ['#corePrice_feature_div .a-offscreen', '.a-price .a-offscreen', '#priceblock_ourprice'],
+            ['[data-hook="review-body"]'],
+        ),
+        'target.com': (
+            ['[data-test="product-title"]'],
+            ['[data-test="product-price"]'],
+            ['[data-test="review-card--text"]'],
+        ),
+        'walmart.com': (
+            ['h1[itemprop="name"]'],
+            ['[itemprop="price"]'],
+            ['[itemprop="reviewBody"]'],
+        ),
+        'bestbuy.com': (
+            ['.sku-title h1'],
+            ['.priceView-customer-price span'],
+            ['.ugc-review-body p'],
+        ),
+    }.items()
+}
+_GENERIC_SELECTORS = (_NAME_SELECTORS, _PRICE_SELECTORS, _REVIEW_SELECTORS)
+
+
+@lru_cache(maxsize=1024)
+def _netloc(url: str) -> str:
+    """Network location of a page URL, parsed once per distinct URL"""
+    return urlparse(url).netloc
+
+
+# Bounded interner for strings repeated across live results (domains, insights)
+_INTERN_MAX_SIZE = 4096
+_interned: Dict[str, str] = {}
+
+
+def _intern(value: str) -> str:
+    """Return one shared str per distinct value, evicting the oldest entry when full"""
+    if not value:
+        return value
+    shared = _interned.get(value)
+    if shared is None:
+        if len(_interned) >= _INTERN_MAX_SIZE:
+            del _interned[next(iter(_interned))]
+        shared = _interned[value] = value
+    return shared
+
+
+def _selectors_for(url: str) -> tuple[list[str], list[str], list[str]]:
+    """(name, price, review) selectors for a URL, site-specific when the domain is known"""
+    return _SITE_SELECTORS.get(_netloc(url).removeprefix('www.'), _GENERIC_SELECTORS)
+
+# Runs in the page so name, price candidates and reviews come back in one CDP round-trip
+_EXTRACT_JS = """
+({nameSelectors, priceSelectors, reviewSelectors, limit}) => {
+    const first = (sel) => {
+        try { return document.querySelector(sel); } catch (e) { return null; }
+    };
+    let name = null;
+    for (const sel of nameSelectors) {
+        const el = first(sel);
+        const text = el && (el.innerText || '').trim();
+        if (text) { name = text.slice(0, 100); break; }
+    }
+    const priceTexts = [];
+    for (const sel of priceSelectors) {
+        const el = first(sel);
+        if (el && el.innerText) priceTexts.push(el.innerText);
+    }
+    const dollarSpan = Array.from(document.querySelectorAll('span'))
+        .find(el => (el.innerText || '').includes('$'));
+    if (dollarSpan) priceTexts.push(dollarSpan.innerText);
+    if (!priceTexts.some(text => /\\d/.test(text))) {
+        // Last resort: regex over the rendered text in-page, shipping back only the match
+        const match = ((document.body && document.body.innerText) || '').match(/\\$[\\d,]+\\.?\\d*/);
+        if (match) priceTexts.push(match[0]);
+    }
+    const reviews = [];
+    for (const sel of reviewSelectors) {
+        let els = [];
+        try { els = document.querySelectorAll(sel); } catch (e) { continue; }
+        for (const el of els) {
+            const text = (el.innerText || '').trim();
+            if (text.length > 20) {
+                reviews.push(text.slice(0, 500));
+                if (reviews.length >= limit) break;
+            }
+        }
+        if (reviews.length) break;
+    }
+    return {name, priceTexts, reviews};
+}
+"""
+
+
 class BrowserScraper:
     """Autonomous browser scraper with stealth capabilities"""
     
     def __init__(self):
         self.browser: Optional[Browser] = None
         self.playwright = None
+        self._contexts: List[BrowserContext] = []
+        # Idle stealth contexts; each scrape checks one out and returns it when done
+        self._ctx_pool: asyncio.Queue[BrowserContext] = asyncio.Queue()
+        self._http: Optional[httpx.AsyncClient] = None
+        # Scraper-local RNG for user agents and demo sampling, independent of the global random state
+        self._rng = random.Random()
+        # Caps for live scraping fan-out: overall, and per host so one site is not hammered
+        self._live_sem = asyncio.Semaphore(config.LIVE_SCRAPE_CONCURRENCY)
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        # url -> (monotonic timestamp, result), oldest first
+        self._live_cache: OrderedDict[str, tuple[float, Dict]] = OrderedDict()
+        # url -> future for a scrape in progress, so concurrent misses share one result
+        self._inflight: Dict[str, asyncio.Future] = {}
     
     async def initialize(self):
         """Initialize Playwright browser with cloud-compatible settings"""
@@ -33,32 +258,75 @@ class BrowserScraper:
                 '--single-process'
             ]
         )
+        
+        # Pooled HTTP client for the static-HTML fast path
+        self._http = httpx.AsyncClient(
+            timeout=10.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=config.LIVE_SCRAPE_CONCURRENCY)
+        )
+        
+        # Live scrapes check contexts out of this pool, so it must never start empty
+        await self.warmup_contexts(config.CONTEXT_POOL_SIZE)
+    
+    async def warmup_contexts(self, n: int = config.CONTEXT_POOL_SIZE):
+        """
+        Create n long-lived stealth contexts and add them to the pool.
+        initialize() fills the pool with CONTEXT_POOL_SIZE; call again only to grow it.
+        Contexts live until close().
+        """
+        if n < 1:
+            raise ValueError(f"Context pool size must be at least 1, got {n} (check CONTEXT_POOL_SIZE)")
+        offset = len(self._contexts)
+        contexts = await asyncio.gather(*(
+            self._new_stealth_context(config.USER_AGENTS[(offset + i) % len(config.USER_AGENTS)])
+            for i in range(n)
+        ))
+        for context in contexts:
+            self._contexts.append(context)
+            self._ctx_pool.put_nowait(context)
+    
+    async def _new_stealth_context(self, user_agent: str) -> BrowserContext:
+        """Context with the stealth script and resource blocking registered once, up front"""
+        context = await self.browser.new_context(
+            user_agent=user_agent,
+            viewport={'width': 1920, 'height': 1080},
+            locale='en-US',
+        )
+        await context.add_init_script(STEALTH_JS)
+        await context.route("**/*", _block_heavy_resources)
+        return context
     
     async def close(self):
         """Clean up browser resources"""
+        if self._http:
+            await self._http.aclose()
+        for context in self._contexts:
+            await context.close()
+        self._contexts.clear()
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
     
-    async def create_stealth_page(self) -> Page:
-        """Create a new page with stealth settings"""
-        context = await self.browser.new_context(
-            user_agent=random.choice(config.USER_AGENTS),
-            viewport={'width': 1920, 'height': 1080},
-            locale='en-US',
-        )
-        
-        page = await context.new_page()
-        
-        # Override webdriver detection
-        await page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
-        
-        return page
+    @asynccontextmanager
+    async def acquire_page(self) -> AsyncIterator[Page]:
+        """
+        Check out an idle pre-warmed stealth context and open a page in it.
+        The page is closed and the context returned to the pool on exit.
+        """
+        if not self._contexts:
+            # An empty pool would block forever; fail fast instead
+            raise RuntimeError("No browser contexts available; call initialize() first")
+        context = await self._ctx_pool.get()
+        try:
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                await page.close()
+        finally:
+            self._ctx_pool.put_nowait(context)
     
     async def scrape_demo_data(self, target: str = 'default') -> List[Dict]:
         """
@@ -69,123 +337,229 @@ class BrowserScraper:
         
         # LIVE URL MODE: If target is a URL, scrape real data
         if target.startswith('http://') or target.startswith('https://'):
-            print(f"Live scraping mode: {target}")
+            logger.debug("Live scraping mode: %s", target)
             try:
                 live_data = await self.scrape_live_site(target)
                 if live_data:
                     results.append(live_data)
                     return results
                 else:
-                    print(f"Live scraping failed, falling back to demo mode")
+                    logger.warning("Live scraping failed for %s, falling back to demo mode", target)
+            except UnscrapableURLError:
+                # The caller's URL is bad; demo products in its place would hide that
+                raise
             except Exception as e:
-                print(f"Live scraping error: {e}. Falling back to demo mode.")
+                logger.warning("Live scraping error: %s. Falling back to demo mode.", e)
+        
+        # DEMO MODE: Default behavior with randomized product pool (no browser needed)
+        num_products = self._rng.randint(3, 5)
+        selected = self._rng.sample(_PRODUCT_POOL, min(len(_PRODUCT_POOL), num_products))
+        
+        # Copy only the sampled entries; the shared pool is never mutated and the copies share its strings
+        results.extend(dict(product) for product in selected)
+        
+        if config.SIMULATE_DELAY:
+            # Optional demo realism; off by default so the demo path returns immediately
+            await asyncio.sleep(self._rng.uniform(0.05, 0.2))
+        
+        return results
+    
+    async def scrape_live_sites(self, urls: List[str]) -> List[Optional[Dict]]:
+        """
+        Scrape several live product pages concurrently.
+        Results are returned in input order; failures come back as exceptions.
+        """
+        async def scrape_one(url: str) -> Optional[Dict]:
+            host = _netloc(url)
+            host_sem = self._host_sems.setdefault(host, asyncio.Semaphore(config.PER_HOST_CONCURRENCY))
+            # Take the host slot first so a busy host never holds a global slot idle
+            async with host_sem, self._live_sem:
+                return await self.scrape_live_site(url)
+        
+        return await asyncio.gather(*(scrape_one(url) for url in urls), return_exceptions=True)
+    
+    async def scrape_live_site(self, url: str) -> Optional[Dict]:
+        """Scrape live product page, serving repeat URLs from a short-lived cache"""
+        cached = self._cached_live_result(url)
+        if cached:
+            return cached
         
-        # DEMO MODE: Default behavior with randomized product pool
-        page = await self.create_stealth_page()
+        if url in self._inflight:
+            return await self._inflight[url]
         
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
         try:
-            if target == 'default' or not results:
-                # Comprehensive product pool
-                product_pool = [
-                    {'name': 'UltraSound Pro Headphones', 'category': 'Electronics', 'competitor': 'AudioTech', 
-                     'price': 149.99, 'sentiment_score': 0.85, 'sentiment_text': 'Excellent sound quality',
-                     'insight': 'Strong satisfaction. Premium pricing justified.'},
-                    {'name': 'SmartHome Hub Pro', 'category': 'Electronics', 'competitor': 'HomeTech', 
-                     'price': 89.99, 'sentiment_score': 0.78, 'sentiment_text': 'Easy setup',
-                     'insight': 'Good value at $90.'},
-                    {'name': 'Air Purifier Max', 'category': 'Home Appliances', 'competitor': 'CleanAir', 
-                     'price': 159.99, 'sentiment_score': 0.91, 'sentiment_text': 'Great air quality',
-                     'insight': 'TOP PERFORMER - Capitalize on health trends.'},
-                ]
-                
-                num_products = random.randint(3, 5)
-                selected_products = random.sample(product_pool, min(len(product_pool), num_products))
-                
-                for product in selected_products:
-                    slug = product['name'].lower().replace(' ', '-')
-                    product['source_url'] = f"https://example.com/products/{slug}"
-                    product['sentiment_source_url'] = f"https://example.com/reviews/{slug}"
-                
-                results.extend(selected_products)
-            
-            await asyncio.sleep(1)
-            
+            result = await self._scrape_live_page(url)
+            # Only successful extractions are cached; a page that yielded no price is retried next time
+            if result and result['price']:
+                self._live_cache[url] = (time.monotonic(), result)
+                self._live_cache.move_to_end(url)
+                if len(self._live_cache) > config.LIVE_CACHE_MAX_SIZE:
+                    self._live_cache.popitem(last=False)
+            future.set_result(result)
+            return result
         except Exception as e:
-            print(f"Scraping error: {e}")
+            future.set_exception(e)
+            # Waiters still get the exception; this only stops asyncio warning when there are none
+            future.exception()
             raise
         finally:
-            await page.close()
-        
-        return results
+            if not future.done():
+                future.cancel()
+            del self._inflight[url]
     
-    async def scrape_live_site(self, url: str) -> Optional[Dict]:
+    def _cached_live_result(self, url: str) -> Optional[Dict]:
+        cached = self._live_cache.get(url)
+        if cached and time.monotonic() - cached[0] < config.LIVE_CACHE_TTL:
+            self._live_cache.move_to_end(url)
+            return cached[1]
+        return None
+    
+    async def _scrape_live_page(self, url: str) -> Optional[Dict]:
         """Scrape live product page for actual price and reviews"""
-        page = await self.create_stealth_page()
+        # Server-rendered pages don't need a browser; only fall back to Playwright when needed
+        fetched = await self._fetch_static(url)
+        if fetched is not None:
+            status, content_type, html = fetched
+            is_dead = 400 <= status < 500 and status not in _BROWSER_RETRY_STATUSES
+            # Only an explicit non-HTML type rules the page out; a missing header goes to the browser
+            is_not_html = status < 400 and content_type and 'html' not in content_type
+            if is_dead or is_not_html:
+                # Dead link or not a web page: a full render won't change that
+                raise UnscrapableURLError(f"{url} returned HTTP {status} ({content_type or 'no content-type'})")
+            if html:
+                static_result = self._parse_static(url, html)
+                if static_result:
+                    return static_result
+        
         try:
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            product_name = await self._extract_product_name(page)
-            price = await self._extract_price_from_page(page)
-            reviews = await self._extract_reviews(page, limit=3)
-            
-            sentiment_score = self._calculate_sentiment_from_reviews(reviews)
-            sentiment_text = reviews[0] if reviews else ''
-            
-            from urllib.parse import urlparse
-            domain = urlparse(url).netloc
-            
-            return {
-                'name': product_name,
-                'category': 'Unknown',
-                'competitor': domain,
-                'price': price,
-                'sentiment_score': sentiment_score,
-                'sentiment_text': sentiment_text[:200] if sentiment_text else '',
-                'raw_reviews': reviews,
-                'source_url': url,
-                'insight': f'Live data extracted from {domain}'
-            }
+            async with self.acquire_page() as page:
+                # Name/price are usually in the initial DOM; don't wait on trackers and ads
+                host = _netloc(url).removeprefix('www.')
+                wait_until, timeout = config.WAIT_STRATEGY.get(host, config.WAIT_STRATEGY['default'])
+                await page.goto(url, wait_until=wait_until, timeout=timeout)
+                try:
+                    # Proceed as soon as the title or a price node is attached
+                    await page.wait_for_selector(
+                        ', '.join(['h1', *_selectors_for(url)[1]]), timeout=5000, state='attached'
+                    )
+                except PlaywrightTimeoutError:
+                    pass
+                product_name, price, reviews = await self._extract_page_data(page, url, limit=3)
+                
+                if not price:
+                    # Price may be rendered client-side: give the page a short settle, then retry once
+                    try:
+                        await page.wait_for_load_state('networkidle', timeout=3000)
+                    except PlaywrightTimeoutError:
+                        pass
+                    product_name, price, reviews = await self._extract_page_data(page, url, limit=3)
+            return self._build_live_result(url, product_name, price, reviews)
         except Exception as e:
-            print(f"Error scraping live URL {url}: {e}")
+            logger.error("Error scraping live URL %s: %s", url, e)
             return None
-        finally:
-            await page.close()
     
-    async def _extract_product_name(self, page: Page) -> str:
-        selectors = ['h1', '[data-test="product-title"]', '.product-title', '#productTitle']
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.inner_text()
-                    if text: return text.strip()[:100]
-            except: continue
-        return 'Unknown Product'
-    
-    async def _extract_price_from_page(self, page: Page) -> float:
-        price_selectors = ['[data-test="product-price"]', '.price', '[itemprop="price"]', 'span:has-text("$")']
-        for selector in price_selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    price = self._extract_price(await element.inner_text())
-                    if price: return price
-            except: continue
-        return 0.0
-
-    async def _extract_reviews(self, page: Page, limit: int = 3) -> list[str]:
-        review_selectors = ['[data-test="review-text"]', '.review-text', '.review-content']
+    async def _fetch_static(self, url: str) -> Optional[tuple[int, str, Optional[str]]]:
+        """
+        Streamed GET of the page, returning (status, lowercased content-type, html).
+        The body is only read for 200 HTML responses up to _STATIC_MAX_BYTES, otherwise html is None.
+        Returns None when the request itself fails.
+        """
+        try:
+            async with self._http.stream(
+                "GET", url, headers={'User-Agent': self._rng.choice(config.USER_AGENTS)}
+            ) as response:
+                # Media types are case-insensitive ("Text/HTML" is HTML)
+                content_type = response.headers.get('content-type', '').lower()
+                html = None
+                if response.status_code == 200 and 'html' in content_type:
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        body += chunk
+                        if len(body) > _STATIC_MAX_BYTES:
+                            break
+                    else:
+                        html = body.decode(response.encoding or 'utf-8', errors='replace')
+                return response.status_code, content_type, html
+        except Exception:
+            return None
+    
+    def _parse_static(self, url: str, html: str, limit: int = 3) -> Optional[Dict]:
+        """
+        Fast path: Lexbor parse of the raw HTML, using the same CSS selectors as the browser path.
+        Returns None unless both a name selector and a price selector match, so client-rendered
+        pages (and stray "$" text like shipping banners) go to the browser instead.
+        """
+        try:
+            tree = LexborHTMLParser(html)
+        except Exception:
+            return None
+        
+        name_selectors, price_selectors, review_selectors = _selectors_for(url)
+        product_name = None
+        for selector in name_selectors:
+            node = tree.css_first(selector)
+            if node and node.text().strip():
+                product_name = node.text().strip()[:100]
+                break
+        if not product_name:
+            return None
+        
+        # Only real price selectors count here; the browser path keeps the looser "$" fallbacks
+        price_texts = [node.text() for node in map(tree.css_first, price_selectors) if node]
+        price = self._first_price(price_texts)
+        if not price:
+            return None
+        
         reviews = []
         for selector in review_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    text = await element.inner_text()
-                    if text and len(text.strip()) > 20:
-                        reviews.append(text.strip()[:500])
-                        if len(reviews) >= limit: break
-                if reviews: break
-            except: continue
-        return reviews
+            for node in tree.css(selector):
+                text = node.text().strip()
+                if len(text) > 20:
+                    reviews.append(text[:500])
+                    if len(reviews) >= limit: break
+            if reviews: break
+        
+        return self._build_live_result(url, product_name, price, reviews)
+    
+    def _build_live_result(self, url: str, product_name: str, price: float, reviews: list[str]) -> Dict:
+        sentiment_score = self._calculate_sentiment_from_reviews(reviews)
+        sentiment_text = reviews[0] if reviews else ''
+        
+        domain = _intern(_netloc(url))
+        
+        return {
+            'name': product_name,
+            'category': 'Unknown',
+            'competitor': domain,
+            'price': price,
+            'sentiment_score': sentiment_score,
+            'sentiment_text': sentiment_text[:200] if sentiment_text else '',
+            'raw_reviews': reviews,
+            'source_url': url,
+            'insight': _intern(f'Live data extracted from {domain}')
+        }
+    
+    async def _extract_page_data(self, page: Page, url: str, limit: int = 3) -> tuple[str, float, list[str]]:
+        """Extract product name, price and reviews with a single in-page evaluation"""
+        name_selectors, price_selectors, review_selectors = _selectors_for(url)
+        data = await page.evaluate(_EXTRACT_JS, {
+            'nameSelectors': name_selectors,
+            'priceSelectors': price_selectors,
+            'reviewSelectors': review_selectors,
+            'limit': limit,
+        })
+        
+        return data['name'] or 'Unknown Product', self._first_price(data['priceTexts']), data['reviews']
+    
+    def _first_price(self, price_texts: list[str]) -> float:
+        """First parseable price among candidate texts, in selector order"""
+        for price_text in price_texts:
+            price = self._extract_price(price_text)
+            if price:
+                return price
+        return 0.0
 
     def _calculate_sentiment_from_reviews(self, reviews: list[str]) -> float:
         if not reviews: return 0.0
@@ -193,13 +567,15 @@ class BrowserScraper:
         return sum(scores) / len(scores)
 
     def _extract_price(self, price_text: str) -> Optional[float]:
-        price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
+        # Fast path: most price nodes hold just the amount, so one translate pass + float() is enough
+        cleaned = price_text.translate(_PRICE_STRIP).strip(_PRICE_EDGES)
+        # Only plain ASCII digits with at most one '.'; float() alone would also take "1e5" or "1_000"
+        if cleaned[:1].isdigit() and cleaned.isascii() and cleaned.replace('.', '', 1).isdigit():
+            return float(cleaned)
+        price_match = _PRICE_RE.search(price_text.replace(',', ''))
         return float(price_match.group()) if price_match else None
 
     def _estimate_sentiment(self, text: str) -> float:
-        text_lower = text.lower()
-        pos = ['great', 'excellent', 'amazing', 'love', 'perfect']
-        neg = ['bad', 'terrible', 'poor', 'worst', 'waste']
-        p_count = sum(1 for w in pos if w in text_lower)
-        n_count = sum(1 for w in neg if w in text_lower)
-        return (p_count - n_count) / (p_count + n_count) if (p_count + n_count) > 0 else 0.0
\ No newline at end of file
+        # One regex pass finds every keyword hit; each hit counts +1 or -1
+        hits = _SENT_RE.findall(text.lower())
+        return sum(_SENT_SIGN[hit] for hit in hits) / len(hits) if hits else 0.0
\ No newline at end of file
@@ -7,10 +7,34 @@ load_dotenv()
 class Config:
     # Node.js backend
     NODE_BACKEND_URL = os.getenv('NODE_BACKEND_URL', 'http://localhost:3000')
+    # HTTP/2 is negotiated over TLS, so it multiplexes when the backend sits behind an
+    # https proxy that terminates H2; plain http:// backends keep HTTP/1.1 keep-alive
+    BACKEND_HTTP2 = os.getenv('BACKEND_HTTP2', 'true').lower() == 'true'
+    BACKEND_MAX_KEEPALIVE = int(os.getenv('BACKEND_MAX_KEEPALIVE', '64'))
+    BACKEND_MAX_CONNECTIONS = int(os.getenv('BACKEND_MAX_CONNECTIONS', '128'))
     
     # Browser settings
     HEADLESS = os.getenv('HEADLESS', 'true').lower() == 'true'
     BROWSER_TIMEOUT = int(os.getenv('BROWSER_TIMEOUT', '30000'))  # 30 seconds
+    CONTEXT_POOL_SIZE = int(os.getenv('CONTEXT_POOL_SIZE', '4'))  # Pre-warmed stealth contexts, one page each at a time
+    LIVE_SCRAPE_CONCURRENCY = int(os.getenv('LIVE_SCRAPE_CONCURRENCY', '16'))  # Live pages scraped at once
+    PER_HOST_CONCURRENCY = int(os.getenv('PER_HOST_CONCURRENCY', '4'))  # Live pages at once per site
+    LIVE_CACHE_TTL = float(os.getenv('LIVE_CACHE_TTL', '300'))  # Seconds a scraped URL is reused
+    LIVE_CACHE_MAX_SIZE = int(os.getenv('LIVE_CACHE_MAX_SIZE', '1000'))  # Cached URLs kept
+    SIMULATE_DELAY = os.getenv('SIMULATE_DELAY', 'false').lower() == 'true'  # Add jitter to demo scrapes
+    # Per-host page load strategy: (wait_until, goto timeout in ms), keyed by host without "www."
+    # Hosts that stream beacons indefinitely must never use 'networkidle'
+    WAIT_STRATEGY = {
+        'amazon.com': ('domcontentloaded', 10000),
+        'default': ('domcontentloaded', 15000),
+    }
+    
+    # Grounding settings
+    MAX_CONCURRENCY = int(os.getenv('MAX_CONCURRENCY', '20'))  # Parallel items sent to backend
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '1000'))  # Max agent thoughts waiting to be sent
+    LOG_BATCH_SIZE = int(os.getenv('LOG_BATCH_SIZE', '100'))  # Thoughts per bulk log POST
+    LOG_FLUSH_INTERVAL = float(os.getenv('LOG_FLUSH_INTERVAL', '0.5'))  # Seconds to wait while filling a batch
+    USE_HTTPXR = os.getenv('USE_HTTPXR', 'false').lower() == 'true'  # Rust-backed httpx drop-in, if installed
     
     # Scraping targets - Demo URLs for testing
     # In production, these would be real competitor sites
@@ -1,6 +1,9 @@
 import os
 import asyncio
+import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
 # CRITICAL: Fix for Python 3.14 subprocess issues on Windows
 if os.name == 'nt':
@@ -10,6 +13,15 @@ if os.name == 'nt':
     print(f"DEBUG: HOME set to {os.environ.get('HOME')}")
     print("DEBUG: WindowsProactorEventLoopPolicy enforced")
 
+# uvloop (installed with uvicorn[standard] on Linux/macOS) drives the scraper and backend I/O
+uvloop = None
+if os.name != 'nt':
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        uvloop = None
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
@@ -21,20 +33,38 @@ from agent.grounding import GroundingValidator
 from config import config
 
 
+logger = logging.getLogger("velocity.main")
+
 # Global scraper instance
 scraper = None
 
 
+def setup_logging() -> QueueListener:
+    """
+    Route 'velocity.*' loggers through a queue so stdout writes happen
+    on a background thread instead of blocking the event loop.
+    """
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("velocity")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = [QueueHandler(log_queue)]
+    return QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage browser lifecycle"""
     global scraper
+    log_listener = setup_logging()
+    log_listener.start()
     scraper = BrowserScraper()
     await scraper.initialize()
-    print("Browser initialized")
+    logger.info("Browser initialized")
     yield
     await scraper.close()
-    print("Browser closed")
+    logger.info("Browser closed")
+    log_listener.stop()
 
 
 # Create FastAPI app
@@ -75,45 +105,49 @@ async def scrape_data(request: ScrapeRequest):
         raise HTTPException(status_code=503, detail="Browser not initialized")
     
     try:
-        print("\n" + "="*60)
-        print("VELOCITY AGENT - AUTONOMOUS SCRAPING INITIATED")
-        print("="*60)
-        print(f"Targets: {', '.join(request.targets)}")
-        print("="*60 + "\n")
+        # Duplicate targets would only repeat the same scrape; keep first occurrences in order
+        targets = list(dict.fromkeys(request.targets))
+        logger.info("[SCRAPING] Targets: %s", ', '.join(targets))
         
         all_results = []
         errors = []
         
-        # Process each target
-        for target in request.targets:
-            try:
-                print(f"\n[SCRAPING] Target: {target}")
-                scraped_data = await scraper.scrape_demo_data(target)
-                all_results.extend(scraped_data)
-                print(f"[SCRAPING] Found {len(scraped_data)} items")
-            except Exception as e:
-                error_msg = f"Failed to scrape {target}: {str(e)}"
+        # Scrape targets concurrently, at most one per pooled browser context
+        sem = asyncio.Semaphore(max(1, min(len(targets), config.CONTEXT_POOL_SIZE)))
+        
+        async def scrape_target(target: str):
+            async with sem:
+                logger.debug("[SCRAPING] Target: %s", target)
+                return await scraper.scrape_demo_data(target)
+        
+        gathered = await asyncio.gather(
+            *(scrape_target(target) for target in targets),
+            return_exceptions=True
+        )
+        
+        # Collect in target order so results stay deterministic
+        for target, scraped_data in zip(targets, gathered):
+            if isinstance(scraped_data, Exception):
+                error_msg = f"Failed to scrape {target}: {str(scraped_data)}"
                 errors.append(error_msg)
-                print(f"[SCRAPING] Failed: {error_msg}")
+                logger.warning("[SCRAPING] Failed: %s", error_msg)
+            else:
+                all_results.extend(scraped_data)
+                logger.debug("[SCRAPING] Found %d items for %s", len(scraped_data), target)
         
         # Apply verified grounding
-        print(f"\n[GROUNDING] Validating {len(all_results)} items with source verification...")
-        validator = GroundingValidator()
-        results = await validator.process_scraped_data(all_results)
+        logger.info("[GROUNDING] Validating %d items with source verification", len(all_results))
+        async with GroundingValidator() as validator:
+            results = await validator.process_scraped_data(all_results)
         
         # Merge errors
         if results.get('errors'):
             errors.extend(results['errors'])
         
-        print("\n" + "="*60)
-        print("SCRAPING COMPLETE")
-        print("="*60)
-        print(f"Products: {results['products_created']}")
-        print(f"Prices: {results['prices_added']} (all verified with source URLs)")
-        print(f"Sentiments: {results['sentiments_added']} (all verified with source URLs)")
-        if errors:
-            print(f"Errors: {len(errors)}")
-        print("="*60 + "\n")
+        logger.info(
+            "[SCRAPING] Complete - products: %d, prices: %d, sentiments: %d, errors: %d",
+            results['products_created'], results['prices_added'], results['sentiments_added'], len(errors)
+        )
         
         return ScrapeResult(
             success=True,
@@ -123,7 +157,7 @@ async def scrape_data(request: ScrapeRequest):
         )
     
     except Exception as e:
-        print(f"\n[ERROR] {str(e)}\n")
+        logger.exception("[ERROR] %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -160,5 +194,5 @@ if __name__ == "__main__":
         port=8000,
         reload=False,  # Disable reload for stability on Python 3.14/Windows
         log_level="info",
-        loop="asyncio" # Explicitly use asyncio loop
+        loop="uvloop" if uvloop else "asyncio" # Explicit loop; Windows keeps the Proactor policy
     )
@@ -239,6 +239,21 @@ const dbHelpers = {
         saveDatabase();
     },
 
+    createLogs: (entries) => {
+        const stmt = db.prepare(`
+            INSERT INTO agent_logs (action, status, details, timestamp)
+            VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        `);
+        for (const { action, status, details = null, timestamp = null } of entries) {
+            stmt.run([action, status, details, timestamp]);
+        }
+        stmt.free();
+
+        // Persist once for the whole batch
+        saveDatabase();
+        return entries.length;
+    },
+
     // Analytics
     getProductWithDetails: (productId) => {
         const stmt1 = db.prepare('SELECT * FROM products WHERE id = ?');
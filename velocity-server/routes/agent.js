@@ -18,6 +18,32 @@ router.get('/logs', (req, res) => {
     }
 });
 
+// POST /api/agent/log/bulk - Record a batch of agent thoughts (from agent)
+router.post('/log/bulk', (req, res) => {
+    try {
+        const { entries } = req.body;
+
+        if (!Array.isArray(entries)) {
+            return res.status(400).json({
+                success: false,
+                error: 'entries must be an array'
+            });
+        }
+
+        if (entries.some(entry => !entry || !entry.action || !entry.status)) {
+            return res.status(400).json({
+                success: false,
+                error: 'Each entry requires action and status'
+            });
+        }
+
+        const count = dbHelpers.createLogs(entries);
+        res.status(201).json({ success: true, count });
+    } catch (error) {
+        res.status(500).json({ success: false, error: error.message });
+    }
+});
+
 // POST /api/agent/start-scan
 router.post('/start-scan', async (req, res) => {
     try {